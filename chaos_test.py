@@ -12,21 +12,691 @@ import requests
 import subprocess
 import sys
 import argparse
-from typing import Dict, List, Optional, Tuple
+import sqlite3
+import uuid
+import atexit
+import queue
+import threading
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
 import logging
+import logging.handlers
+
+import numpy as np
+
+# Fields attached to probe log records via `extra` and emitted as structured JSON
+STRUCTURED_LOG_FIELDS = ("region", "phase", "probe", "port", "latency_ms")
+
+# Upper bound on log records buffered between the probe threads and the log writer
+LOG_QUEUE_SIZE = 10000
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects for chaos_test.log"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage()
+        }
+        for field in STRUCTURED_LOG_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        return json.dumps(entry)
+
+
+class ConsoleLogFormatter(logging.Formatter):
+    """Human-readable console format with structured fields appended when present"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = [
+            f"{field}={getattr(record, field)}"
+            for field in STRUCTURED_LOG_FIELDS
+            if getattr(record, field, None) is not None
+        ]
+        return f"{line} [{' '.join(fields)}]" if fields else line
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that never blocks the caller, counting records dropped when the queue is full"""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """Queue listener whose stop waits for room in a full queue instead of failing"""
+    
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+def configure_logging(log_file: str = 'chaos_test.log',
+                      queue_size: int = LOG_QUEUE_SIZE) -> DrainingQueueListener:
+    """Route all logging through a bounded queue so file and console writes happen off the probe threads"""
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(JsonLogFormatter())
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(ConsoleLogFormatter('%(asctime)s - %(levelname)s - %(message)s'))
+    
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    listener = DrainingQueueListener(
+        queue_handler.queue, file_handler, console_handler, respect_handler_level=True
+    )
+    
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(queue_handler)
+    listener.start()
+    
+    def shutdown():
+        root_logger.removeHandler(queue_handler)
+        listener.stop()
+        if queue_handler.dropped:
+            warning = logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                f"Dropped {queue_handler.dropped} log records because the log queue was full",
+                None, None
+            )
+            for handler in listener.handlers:
+                handler.handle(warning)
+        for handler in listener.handlers:
+            handler.close()
+    
+    atexit.register(shutdown)
+    return listener
+
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('chaos_test.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# HostConfig fields captured before a resource-pressure ramp and restored afterwards
+RESOURCE_LIMIT_FIELDS = ("NanoCpus", "CpuPeriod", "CpuQuota", "Memory", "MemorySwap", "BlkioWeight")
+
+# CFS period Docker uses when a container has no explicit --cpu-period
+DEFAULT_CPU_PERIOD = 100000
+
+# Block-I/O weight a cgroup v1 blkio controller assigns when none is configured.
+# cgroup v2 uses io.weight (default 100) on a different scale, so there is no equivalent to restore there.
+CGROUP_V1_DEFAULT_BLKIO_WEIGHT = 500
+
+DEFAULT_RESOURCE_PRESSURE_CONFIG = {
+    "step_duration": 5,
+    "requests_per_step": 50,
+    "error_rate_threshold": 0.05,
+    "latency_degradation_factor": 3.0,
+    "profiles": {
+        "cpu_ramp": [
+            {"name": "cpu_1.0", "cpus": 1.0},
+            {"name": "cpu_0.5", "cpus": 0.5},
+            {"name": "cpu_0.25", "cpus": 0.25},
+            {"name": "cpu_0.1", "cpus": 0.1},
+            {"name": "cpu_0.05", "cpus": 0.05}
+        ],
+        "memory_ramp": [
+            {"name": "mem_256m", "memory_mb": 256},
+            {"name": "mem_128m", "memory_mb": 128},
+            {"name": "mem_64m", "memory_mb": 64},
+            {"name": "mem_32m", "memory_mb": 32},
+            {"name": "mem_16m", "memory_mb": 16}
+        ],
+        "io_ramp": [
+            {"name": "blkio_500", "blkio_weight": 500},
+            {"name": "blkio_250", "blkio_weight": 250},
+            {"name": "blkio_100", "blkio_weight": 100},
+            {"name": "blkio_10", "blkio_weight": 10}
+        ],
+        "noisy_neighbour": [
+            {"name": "light", "cpus": 0.5, "memory_mb": 256, "blkio_weight": 250},
+            {"name": "moderate", "cpus": 0.25, "memory_mb": 128, "blkio_weight": 100},
+            {"name": "heavy", "cpus": 0.1, "memory_mb": 64, "blkio_weight": 10}
+        ]
+    }
+}
+
+
+# Labels that explicitly place a container in the chaos topology, checked before any ECS metadata
+REGION_LABEL = "chaos.region"
+SERVICE_LABEL = "chaos.service"
+TASK_LABEL = "chaos.task"
+
+# Labels the ECS agent (and LocalStack's ECS emulation) attaches to task containers
+ECS_TASK_ARN_LABEL = "com.amazonaws.ecs.task-arn"
+ECS_CLUSTER_LABEL = "com.amazonaws.ecs.cluster"
+ECS_TASK_FAMILY_LABEL = "com.amazonaws.ecs.task-definition-family"
+ECS_CONTAINER_NAME_LABEL = "com.amazonaws.ecs.container-name"
+
+
+class ContainerTopology:
+    """Snapshot of every container mapped to its region, service, task and host-port mappings.
+    Only containers positively identified as service tasks (by a service or task label) are indexed
+    by region, so chaos actions never touch unrelated containers such as the one running this script"""
+    
+    def __init__(self, containers: List[Dict]):
+        self.containers = containers
+        self.by_id: Dict[str, Dict] = {}
+        self.by_region: Dict[str, List[Dict]] = {}
+        self.by_service: Dict[str, List[Dict]] = {}
+        self.by_task: Dict[str, List[Dict]] = {}
+        
+        for container in containers:
+            self.by_id[container["id"]] = container
+            if not self.is_service_task(container):
+                continue
+            if container["region"]:
+                self.by_region.setdefault(container["region"], []).append(container)
+            if container["service"]:
+                self.by_service.setdefault(container["service"], []).append(container)
+            if container["task"]:
+                self.by_task.setdefault(container["task"], []).append(container)
+    
+    @staticmethod
+    def is_service_task(container: Dict) -> bool:
+        return bool(container["service"] or container["task"])
+    
+    def containers_for_region(self, region: str, state: Optional[str] = "running") -> List[Dict]:
+        """Containers of a region, optionally restricted to one Docker state (e.g. "running", "exited")"""
+        return [
+            container for container in self.by_region.get(region, [])
+            if state is None or container["state"] == state
+        ]
+    
+    def endpoints(self, region: Optional[str] = None, image_filter: str = "nginx",
+                  container_port: int = 80) -> Dict[str, List[int]]:
+        """Host ports publishing `container_port` on every running replica whose image matches, grouped by region"""
+        regions = [region] if region else list(self.by_region)
+        endpoints = {}
+        for region_name in regions:
+            ports = [
+                mapping["host_port"]
+                for container in self.containers_for_region(region_name)
+                if image_filter in container["image"].lower()
+                for mapping in container["ports"]
+                if mapping["protocol"] == "tcp" and mapping["container_port"] == container_port
+            ]
+            if ports:
+                endpoints[region_name] = ports
+        return endpoints
+    
+    def unassigned(self) -> List[Dict]:
+        """Containers that are not service tasks or whose region could not be determined"""
+        return [
+            container for container in self.containers
+            if not (self.is_service_task(container) and container["region"])
+        ]
+
+
+class TopologyDiscovery:
+    """Build and cache the container topology, re-inspecting only when the set of containers changes"""
+    
+    def __init__(self, regions: List[str], refresh_interval: float = 2.0):
+        self.regions = regions
+        self.refresh_interval = refresh_interval
+        self._topology: Optional[ContainerTopology] = None
+        self._signature: Optional[str] = None
+        self._checked_at = 0.0
+    
+    def invalidate(self) -> None:
+        """Force the next lookup to re-check the containers, e.g. after stopping or starting some"""
+        self._checked_at = 0.0
+    
+    def get_topology(self) -> ContainerTopology:
+        """Return the cached topology, recomputing it if container IDs, states or ports changed"""
+        now = time.monotonic()
+        if self._topology is not None and now - self._checked_at < self.refresh_interval:
+            return self._topology
+        
+        signature = self._container_signature()
+        if self._topology is None or signature is None or signature != self._signature:
+            self._topology = self._discover()
+            self._signature = signature
+        self._checked_at = now
+        return self._topology
+    
+    def _container_signature(self) -> Optional[str]:
+        """Cheap fingerprint of which containers exist, their state and their published ports"""
+        cmd = ["docker", "ps", "-a", "--no-trunc", "--format", "{{.ID}} {{.State}} {{.Ports}}"]
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        if result.returncode != 0:
+            logger.error(f"Failed to list containers: {result.stderr}")
+            return None
+        return "\n".join(sorted(result.stdout.strip().split('\n')))
+    
+    def _discover(self) -> ContainerTopology:
+        """Inspect every container and resolve its place in the topology"""
+        try:
+            cmd = ["docker", "ps", "-a", "-q", "--no-trunc"]
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            if result.returncode != 0:
+                logger.error(f"Failed to list containers: {result.stderr}")
+                return ContainerTopology([])
+            
+            container_ids = result.stdout.split()
+            if not container_ids:
+                return ContainerTopology([])
+            
+            cmd = ["docker", "inspect"] + container_ids
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            if not result.stdout.strip():
+                logger.error(f"Failed to inspect containers: {result.stderr}")
+                return ContainerTopology([])
+            if result.returncode != 0:
+                # Containers removed since `docker ps` (e.g. ECS replacing a task) make inspect fail,
+                # but it still prints the others
+                logger.warning(f"Some containers could not be inspected: {result.stderr.strip()}")
+            
+            topology = ContainerTopology([self._describe(info) for info in json.loads(result.stdout)])
+        except Exception as e:
+            logger.error(f"Error discovering container topology: {e}")
+            return ContainerTopology([])
+        
+        for container in topology.unassigned():
+            logger.debug(f"Container {container['name']} is not a service task in a known region, ignoring it")
+        logger.info(
+            "Discovered topology: " + ", ".join(
+                f"{region}: {len(containers)} containers in {len({c['task'] for c in containers})} tasks"
+                for region, containers in topology.by_region.items()
+            )
+        )
+        return topology
+    
+    def _describe(self, info: Dict) -> Dict:
+        """Turn a `docker inspect` entry into a topology record"""
+        config = info.get("Config") or {}
+        labels = config.get("Labels") or {}
+        name = info.get("Name", "").lstrip("/")
+        
+        return {
+            "id": info.get("Id", ""),
+            "name": name,
+            "image": config.get("Image", ""),
+            "state": (info.get("State") or {}).get("Status", ""),
+            "region": self._resolve_region(labels, name),
+            "service": (
+                labels.get(SERVICE_LABEL)
+                or labels.get(ECS_TASK_FAMILY_LABEL)
+                or labels.get(ECS_CONTAINER_NAME_LABEL)
+            ),
+            "task": (
+                labels.get(TASK_LABEL)
+                or labels.get(ECS_TASK_ARN_LABEL, "").split("/")[-1]
+                or None
+            ),
+            "ports": self._parse_port_mappings((info.get("NetworkSettings") or {}).get("Ports") or {})
+        }
+    
+    def _resolve_region(self, labels: Dict[str, str], name: str) -> Optional[str]:
+        """Region from explicit label, ECS task ARN, ECS cluster, then container name"""
+        if labels.get(REGION_LABEL):
+            return labels[REGION_LABEL]
+        
+        # arn:aws:ecs:<region>:<account>:task/<cluster>/<task-id>
+        arn_parts = labels.get(ECS_TASK_ARN_LABEL, "").split(":")
+        if len(arn_parts) > 3 and arn_parts[3]:
+            return arn_parts[3]
+        
+        candidates = [labels.get(ECS_CLUSTER_LABEL, ""), name.lower()]
+        for candidate in candidates:
+            for region in self.regions:
+                if region in candidate or region.replace('-', '') in candidate:
+                    return region
+        return None
+    
+    @staticmethod
+    def _parse_port_mappings(ports: Dict) -> List[Dict]:
+        """Every published host port, de-duplicating the IPv4/IPv6 bindings of the same port"""
+        mappings = []
+        seen = set()
+        for container_port, bindings in ports.items():
+            port, _, protocol = container_port.partition("/")
+            for binding in bindings or []:
+                host_port = int(binding.get("HostPort") or 0)
+                if not host_port or (host_port, protocol) in seen:
+                    continue
+                seen.add((host_port, protocol))
+                mappings.append({
+                    "container_port": int(port),
+                    "protocol": protocol or "tcp",
+                    "host_ip": binding.get("HostIp", ""),
+                    "host_port": host_port
+                })
+        return mappings
+
+
+class ResultsHistoryStore:
+    """SQLite-backed history of chaos test runs for trend and regression analysis"""
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id TEXT PRIMARY KEY,
+            start_time TEXT NOT NULL,
+            end_time TEXT,
+            overall_status TEXT
+        );
+        CREATE TABLE IF NOT EXISTS scenario_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT NOT NULL REFERENCES runs(run_id),
+            scenario TEXT NOT NULL,
+            failed_region TEXT,
+            timestamp TEXT NOT NULL,
+            chaos_injection_success INTEGER,
+            restoration_success INTEGER,
+            overall_success INTEGER,
+            recovery_time_seconds REAL,
+            error_rate REAL
+        );
+        CREATE TABLE IF NOT EXISTS probe_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT NOT NULL REFERENCES runs(run_id),
+            scenario TEXT NOT NULL,
+            region TEXT NOT NULL,
+            phase TEXT NOT NULL,
+            probe_type TEXT NOT NULL,
+            replica TEXT,
+            success INTEGER NOT NULL,
+            timestamp TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_runs_start_time ON runs(start_time);
+        CREATE INDEX IF NOT EXISTS idx_scenario_results_run ON scenario_results(run_id);
+        CREATE INDEX IF NOT EXISTS idx_scenario_results_scenario_ts ON scenario_results(scenario, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_scenario_results_region ON scenario_results(failed_region);
+        CREATE INDEX IF NOT EXISTS idx_probe_results_run ON probe_results(run_id);
+        CREATE INDEX IF NOT EXISTS idx_probe_results_scenario_region ON probe_results(scenario, region);
+        CREATE INDEX IF NOT EXISTS idx_probe_results_timestamp ON probe_results(timestamp);
+    """
+    
+    # Connectivity sections of a scenario result and the phase name they are stored under
+    PROBE_PHASES = {
+        "connectivity_during_failure": "during_failure",
+        "connectivity_after_restoration": "after_restoration"
+    }
+    
+    def __init__(self, db_path: str = "chaos_history.db"):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(self.SCHEMA)
+        
+        # Databases created before per-replica probes were recorded lack the replica column
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(probe_results)")}
+        if "replica" not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE probe_results ADD COLUMN replica TEXT")
+    
+    def close(self):
+        self.conn.close()
+    
+    def record_run(self, run_id: str, results: Dict) -> None:
+        """Persist a completed run, its scenarios and every individual probe result"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO runs (run_id, start_time, end_time, overall_status) VALUES (?, ?, ?, ?)",
+                (run_id, results.get("start_time", datetime.now().isoformat()),
+                 results.get("end_time"), results.get("overall_status"))
+            )
+            
+            for scenario_name, scenario_data in results.get("scenarios", {}).items():
+                if scenario_data.get("simulated"):
+                    # A simulated scenario never failed anything, so it must not become part of the baseline
+                    logger.info(f"Not recording simulated scenario {scenario_name} in history store")
+                    continue
+                
+                timestamp = scenario_data.get("start_time", results.get("start_time"))
+                self.conn.execute(
+                    "INSERT INTO scenario_results (run_id, scenario, failed_region, timestamp, "
+                    "chaos_injection_success, restoration_success, overall_success, "
+                    "recovery_time_seconds, error_rate) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, scenario_name, scenario_data.get("failed_region"), timestamp,
+                     int(bool(scenario_data.get("chaos_injection_success"))),
+                     int(bool(scenario_data.get("restoration_success"))),
+                     int(bool(scenario_data.get("overall_success"))),
+                     scenario_data.get("recovery_time_seconds"),
+                     scenario_data.get("error_rate"))
+                )
+                
+                probe_rows = []
+                for section, phase in self.PROBE_PHASES.items():
+                    for probe_type, probes in scenario_data.get(section, {}).items():
+                        for region, success in probes.items():
+                            # Replica probes are nested one level deeper, keyed by host port
+                            outcomes = success.items() if isinstance(success, dict) else [(None, success)]
+                            for replica, ok in outcomes:
+                                probe_rows.append((run_id, scenario_name, region, phase,
+                                                   probe_type, replica, int(bool(ok)), timestamp))
+                self.conn.executemany(
+                    "INSERT INTO probe_results (run_id, scenario, region, phase, probe_type, replica, success, timestamp) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    probe_rows
+                )
+        
+        logger.info(f"Recorded run {run_id} in history store {self.db_path}")
+    
+    def fetch_scenario_history(self, scenario: Optional[str] = None,
+                               limit: Optional[int] = None) -> List[Tuple]:
+        """Fetch (run_id, scenario, timestamp, overall_success, recovery_time_seconds, error_rate)
+        rows ordered oldest first, optionally restricted to one scenario and the latest `limit` runs"""
+        query = (
+            "SELECT s.run_id, s.scenario, s.timestamp, s.overall_success, "
+            "s.recovery_time_seconds, s.error_rate FROM scenario_results s"
+        )
+        params: List = []
+        if limit:
+            query += f" JOIN ({self._scenario_runs_query(scenario, limit, params)}) r ON r.run_id = s.run_id"
+        if scenario:
+            query += " WHERE s.scenario = ?"
+            params.append(scenario)
+        query += " ORDER BY s.timestamp"
+        return self.conn.execute(query, params).fetchall()
+    
+    def fetch_probe_history(self, scenario: Optional[str] = None,
+                            limit: Optional[int] = None) -> List[Tuple]:
+        """Fetch (scenario, region, phase, probe_type, success) rows for availability analysis"""
+        query = "SELECT p.scenario, p.region, p.phase, p.probe_type, p.success FROM probe_results p"
+        params: List = []
+        if limit:
+            query += f" JOIN ({self._scenario_runs_query(scenario, limit, params)}) r ON r.run_id = p.run_id"
+        if scenario:
+            query += " WHERE p.scenario = ?"
+            params.append(scenario)
+        return self.conn.execute(query, params).fetchall()
+    
+    @staticmethod
+    def _scenario_runs_query(scenario: Optional[str], limit: int, params: List) -> str:
+        """SQL selecting the run_ids of the latest `limit` runs that recorded scenario results,
+        optionally for one scenario, appending its parameters to `params`"""
+        query = "SELECT r.run_id FROM runs r WHERE EXISTS (SELECT 1 FROM scenario_results s WHERE s.run_id = r.run_id"
+        if scenario:
+            query += " AND s.scenario = ?"
+            params.append(scenario)
+        query += ") ORDER BY r.start_time DESC LIMIT ?"
+        params.append(limit)
+        return query
+    
+    def latest_run_id(self, scenario: Optional[str] = None) -> Optional[str]:
+        """Latest run that recorded scenario results, optionally for one scenario"""
+        params: List = []
+        row = self.conn.execute(self._scenario_runs_query(scenario, 1, params), params).fetchone()
+        return row[0] if row else None
+
+
+class ResultsHistoryAnalyzer:
+    """Vectorized availability, recovery-time and regression analysis over the history store"""
+    
+    RECOVERY_PERCENTILES = [50, 90, 95, 99]
+    
+    def __init__(self, store: ResultsHistoryStore, min_baseline_runs: int = 5,
+                 recovery_percentile: float = 95.0, error_rate_sigma: float = 2.0):
+        self.store = store
+        self.min_baseline_runs = min_baseline_runs
+        self.recovery_percentile = recovery_percentile
+        self.error_rate_sigma = error_rate_sigma
+    
+    @staticmethod
+    def _to_float_array(values) -> np.ndarray:
+        """Convert nullable SQL values to a float array with NaN for missing entries"""
+        return np.array([np.nan if v is None else v for v in values], dtype=float)
+    
+    def availability(self, scenario: Optional[str] = None,
+                     limit: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+        """Fraction of successful probes per scenario, region, phase and probe type"""
+        rows = self.store.fetch_probe_history(scenario, limit)
+        if not rows:
+            return {}
+        
+        keys = np.array([f"{r[0]}|{r[1]}|{r[2]}|{r[3]}" for r in rows])
+        success = np.array([r[4] for r in rows], dtype=float)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse)
+        successes = np.bincount(inverse, weights=success)
+        
+        availability: Dict[str, Dict[str, float]] = {}
+        for key, ok, total in zip(unique_keys, successes, totals):
+            scenario_name, region, phase, probe_type = key.split("|")
+            availability.setdefault(scenario_name, {})[f"{region}/{phase}/{probe_type}"] = float(ok / total)
+        return availability
+    
+    def scenario_statistics(self, scenario: Optional[str] = None,
+                            limit: Optional[int] = None) -> Dict[str, Dict]:
+        """Success rate, recovery-time percentiles and trend slopes per scenario"""
+        statistics = {}
+        for scenario_name, scenario_rows in self._group_history(scenario, limit).items():
+            success = np.array([r[3] for r in scenario_rows], dtype=float)
+            recovery = self._to_float_array([r[4] for r in scenario_rows])
+            error_rate = self._to_float_array([r[5] for r in scenario_rows])
+            
+            valid_recovery = recovery[~np.isnan(recovery)]
+            if valid_recovery.size:
+                percentiles = np.percentile(valid_recovery, self.RECOVERY_PERCENTILES)
+                recovery_percentiles = {
+                    f"p{p}": float(v) for p, v in zip(self.RECOVERY_PERCENTILES, percentiles)
+                }
+            else:
+                recovery_percentiles = {}
+            
+            statistics[scenario_name] = {
+                "runs": len(scenario_rows),
+                "success_rate": float(success.mean()),
+                "recovery_time_percentiles": recovery_percentiles,
+                "mean_error_rate": float(np.nanmean(error_rate)) if np.any(~np.isnan(error_rate)) else None,
+                "recovery_time_trend": self._trend(recovery),
+                "error_rate_trend": self._trend(error_rate)
+            }
+        return statistics
+    
+    @staticmethod
+    def _trend(values: np.ndarray) -> Optional[float]:
+        """Least-squares slope of a metric per run, ignoring runs where it was not measured"""
+        mask = ~np.isnan(values)
+        if mask.sum() < 2:
+            return None
+        x = np.arange(values.size, dtype=float)[mask]
+        slope, _ = np.polyfit(x, values[mask], 1)
+        return float(slope)
+    
+    def detect_regressions(self, run_id: str, scenario: Optional[str] = None,
+                           limit: Optional[int] = None) -> List[Dict]:
+        """Flag scenarios where the given run is worse than the historical baseline"""
+        regressions = []
+        for scenario_name, scenario_rows in self._group_history(scenario, limit).items():
+            current = [r for r in scenario_rows if r[0] == run_id]
+            baseline = [r for r in scenario_rows if r[0] != run_id]
+            if not current or len(baseline) < self.min_baseline_runs:
+                continue
+            current_row = current[-1]
+            
+            baseline_recovery = self._to_float_array([r[4] for r in baseline])
+            baseline_recovery = baseline_recovery[~np.isnan(baseline_recovery)]
+            if current_row[4] is not None and baseline_recovery.size >= self.min_baseline_runs:
+                threshold = float(np.percentile(baseline_recovery, self.recovery_percentile))
+                if current_row[4] > threshold:
+                    regressions.append({
+                        "scenario": scenario_name,
+                        "metric": "recovery_time_seconds",
+                        "current": float(current_row[4]),
+                        "baseline_threshold": threshold
+                    })
+            
+            baseline_errors = self._to_float_array([r[5] for r in baseline])
+            baseline_errors = baseline_errors[~np.isnan(baseline_errors)]
+            if current_row[5] is not None and baseline_errors.size >= self.min_baseline_runs:
+                threshold = float(baseline_errors.mean() + self.error_rate_sigma * baseline_errors.std())
+                if current_row[5] > threshold:
+                    regressions.append({
+                        "scenario": scenario_name,
+                        "metric": "error_rate",
+                        "current": float(current_row[5]),
+                        "baseline_threshold": threshold
+                    })
+        return regressions
+    
+    def _group_history(self, scenario: Optional[str] = None,
+                       limit: Optional[int] = None) -> Dict[str, List[Tuple]]:
+        grouped: Dict[str, List[Tuple]] = {}
+        for row in self.store.fetch_scenario_history(scenario, limit):
+            grouped.setdefault(row[1], []).append(row)
+        return grouped
+    
+    def generate_history_report(self, run_id: Optional[str] = None, scenario: Optional[str] = None,
+                                limit: Optional[int] = None) -> str:
+        """Generate a human-readable report of historical trends and regressions"""
+        report = []
+        report.append("=" * 60)
+        report.append("CHAOS ENGINEERING HISTORICAL TRENDS")
+        report.append("=" * 60)
+        
+        statistics = self.scenario_statistics(scenario, limit)
+        if not statistics:
+            report.append("No historical runs recorded")
+            report.append("=" * 60)
+            return "\n".join(report)
+        
+        availability = self.availability(scenario, limit)
+        for scenario_name, stats in statistics.items():
+            report.append(f"Scenario: {scenario_name}")
+            report.append(f"  Runs: {stats['runs']}")
+            report.append(f"  Success Rate: {stats['success_rate']:.1%}")
+            percentiles = stats["recovery_time_percentiles"]
+            if percentiles:
+                report.append("  Recovery Time: " + ", ".join(
+                    f"{name}={value:.2f}s" for name, value in percentiles.items()
+                ))
+            if stats["mean_error_rate"] is not None:
+                report.append(f"  Mean Error Rate: {stats['mean_error_rate']:.1%}")
+            if stats["recovery_time_trend"] is not None:
+                report.append(f"  Recovery Time Trend: {stats['recovery_time_trend']:+.3f}s per run")
+            if stats["error_rate_trend"] is not None:
+                report.append(f"  Error Rate Trend: {stats['error_rate_trend']:+.4f} per run")
+            for probe, value in sorted(availability.get(scenario_name, {}).items()):
+                report.append(f"  Availability {probe}: {value:.1%}")
+            report.append("")
+        
+        if run_id:
+            regressions = self.detect_regressions(run_id, scenario, limit)
+            if regressions:
+                report.append(f"Regressions in run {run_id}:")
+                for regression in regressions:
+                    report.append(
+                        f"  ✗ {regression['scenario']} {regression['metric']}: "
+                        f"{regression['current']:.3f} > baseline {regression['baseline_threshold']:.3f}"
+                    )
+            else:
+                report.append(f"No regressions detected in run {run_id}")
+        
+        report.append("=" * 60)
+        return "\n".join(report)
+
 
 class ChaosTestSuite:
     """Main class for chaos engineering tests"""
@@ -42,8 +712,15 @@ class ChaosTestSuite:
             self.localstack_endpoint = "http://localhost:4666"
         
         self.regions = ["us-east-1", "us-west-1"]
+        self.topology_discovery = TopologyDiscovery(self.regions)
         self.domain = "example.com"
+        self.run_id = str(uuid.uuid4())
+        self.phase = "setup"
+        self.recovery_timeout = 60.0
+        self.recovery_poll_interval = 2.0
+        self._cgroup_version: Optional[str] = None
         self.test_results = {
+            "run_id": self.run_id,
             "start_time": datetime.now().isoformat(),
             "scenarios": {},
             "overall_status": "UNKNOWN"
@@ -118,127 +795,106 @@ class ChaosTestSuite:
             logger.error(f"Error getting ECS services in {region}: {e}")
             return []
     
+    def _probe_log_fields(self, region: str, probe: str, probe_start: float,
+                          port: Optional[int] = None) -> Dict:
+        """Structured log fields for a probe result, measured before any logging happens"""
+        return {
+            "region": region,
+            "phase": self.phase,
+            "probe": probe,
+            "port": port,
+            "latency_ms": round((time.perf_counter() - probe_start) * 1000, 3)
+        }
+    
     def test_dns_resolution(self) -> Dict[str, bool]:
         """Test DNS resolution for global and regional endpoints"""
         results = {}
         
         # Test global endpoint
+        probe_start = time.perf_counter()
         try:
             cmd = ["curl", "-s", "--resolve", f"{self.domain}:80:127.0.0.1", 
                    f"http://{self.domain}", "--max-time", "10"]
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
             results["global"] = result.returncode == 0
+            log_fields = self._probe_log_fields("global", "dns", probe_start)
             if results["global"]:
-                logger.info(f"Global DNS endpoint accessible: {self.domain}")
+                logger.info(f"Global DNS endpoint accessible: {self.domain}", extra=log_fields)
             else:
-                logger.warning(f"Global DNS endpoint failed: {result.stderr}")
+                logger.warning(f"Global DNS endpoint failed: {result.stderr}", extra=log_fields)
         except Exception as e:
-            logger.error(f"DNS test failed for global endpoint: {e}")
+            logger.error(f"DNS test failed for global endpoint: {e}",
+                         extra=self._probe_log_fields("global", "dns", probe_start))
             results["global"] = False
         
         # Test regional endpoints
         for region in self.regions:
             regional_domain = f"{region}.{self.domain}"
+            probe_start = time.perf_counter()
             try:
                 cmd = ["curl", "-s", "--resolve", f"{regional_domain}:80:127.0.0.1", 
                        f"http://{regional_domain}", "--max-time", "10"]
                 result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
                 results[region] = result.returncode == 0
+                log_fields = self._probe_log_fields(region, "dns", probe_start)
                 if results[region]:
-                    logger.info(f"Regional DNS endpoint accessible: {regional_domain}")
+                    logger.info(f"Regional DNS endpoint accessible: {regional_domain}", extra=log_fields)
                 else:
-                    logger.warning(f"Regional DNS endpoint failed: {result.stderr}")
+                    logger.warning(f"Regional DNS endpoint failed: {result.stderr}", extra=log_fields)
             except Exception as e:
-                logger.error(f"DNS test failed for {region}: {e}")
+                logger.error(f"DNS test failed for {region}: {e}",
+                             extra=self._probe_log_fields(region, "dns", probe_start))
                 results[region] = False
         
         return results
     
-    def get_container_ports(self) -> Dict[str, Optional[int]]:
-        """Get the exposed container ports for nginx containers"""
-        ports = {}
-        
-        try:
-            # Get running containers
-            cmd = ["docker", "ps", "--format", "json"]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0:
-                containers = []
-                for line in result.stdout.strip().split('\n'):
-                    if line:
-                        containers.append(json.loads(line))
-                
-                # Find nginx containers and extract ports
-                for container in containers:
-                    if 'nginx' in container.get('Image', '').lower():
-                        ports_info = container.get('Ports', '')
-                        # Parse port mapping like "0.0.0.0:32768->80/tcp"
-                        if '->' in ports_info:
-                            external_port = ports_info.split(':')[1].split('->')[0]
-                            # Determine region based on container name or other identifier
-                            container_name = container.get('Names', '')
-                            if 'east' in container_name.lower():
-                                ports['us-east-1'] = int(external_port)
-                            elif 'west' in container_name.lower():
-                                ports['us-west-1'] = int(external_port)
-                            else:
-                                # If we can't determine region, assign to available slot
-                                if 'us-east-1' not in ports:
-                                    ports['us-east-1'] = int(external_port)
-                                elif 'us-west-1' not in ports:
-                                    ports['us-west-1'] = int(external_port)
-                
-                logger.info(f"Found container ports: {ports}")
-            else:
-                logger.error(f"Failed to get container information: {result.stderr}")
-        
-        except Exception as e:
-            logger.error(f"Error getting container ports: {e}")
-        
+    def get_container_ports(self) -> Dict[str, List[int]]:
+        """Get the exposed host ports of every running nginx replica, grouped by region"""
+        ports = self.topology_discovery.get_topology().endpoints()
+        logger.info(f"Found container ports: {ports}")
         return ports
     
-    def test_container_connectivity(self, ports: Dict[str, int]) -> Dict[str, bool]:
-        """Test direct connectivity to nginx containers"""
+    def test_container_connectivity(self, ports: Dict[str, List[int]]) -> Tuple[Dict[str, bool], Dict[str, Dict[str, bool]]]:
+        """Test direct connectivity to every nginx replica. Returns a per-region summary (reachable if any
+        replica answers) and the outcome of every replica keyed by region and host port"""
         results = {}
+        replica_results: Dict[str, Dict[str, bool]] = {}
         
-        for region, port in ports.items():
-            try:
-                response = requests.get(f"http://172.17.0.1:{port}", timeout=10)
-                results[region] = response.status_code == 200
-                if results[region]:
-                    logger.info(f"Container connectivity successful for {region} on port {port}")
-                    logger.debug(f"Response content: {response.text[:100]}...")
-                else:
-                    logger.warning(f"Container connectivity failed for {region} on port {port}: HTTP {response.status_code}")
-            except Exception as e:
-                logger.error(f"Container connectivity test failed for {region} on port {port}: {e}")
-                results[region] = False
+        for region, region_ports in ports.items():
+            replica_ok = []
+            for port in region_ports:
+                probe_start = time.perf_counter()
+                try:
+                    response = requests.get(f"http://172.17.0.1:{port}", timeout=10)
+                    ok = response.status_code == 200
+                    log_fields = self._probe_log_fields(region, "container", probe_start, port=port)
+                    if ok:
+                        logger.info(f"Container connectivity successful for {region} on port {port}", extra=log_fields)
+                        logger.debug(f"Response content: {response.text[:100]}...")
+                    else:
+                        logger.warning(f"Container connectivity failed for {region} on port {port}: HTTP {response.status_code}",
+                                       extra=log_fields)
+                except Exception as e:
+                    logger.error(f"Container connectivity test failed for {region} on port {port}: {e}",
+                                 extra=self._probe_log_fields(region, "container", probe_start, port=port))
+                    ok = False
+                replica_ok.append(ok)
+                replica_results.setdefault(region, {})[str(port)] = ok
+            
+            results[region] = any(replica_ok)
+            if results[region] and not all(replica_ok):
+                logger.warning(f"Only {sum(replica_ok)} of {len(replica_ok)} replicas in {region} are reachable")
         
-        return results
+        return results, replica_results
     
     def inject_chaos_docker_failure(self, region: str) -> bool:
         """Inject chaos by stopping Docker containers for a region"""
         try:
-            # Find containers related to the region
-            cmd = ["docker", "ps", "--format", "json"]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode != 0:
-                logger.error(f"Failed to list containers: {result.stderr}")
-                return False
-            
-            containers = []
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    containers.append(json.loads(line))
-            
-            # Find containers for this region
-            region_containers = []
-            for container in containers:
-                container_name = container.get('Names', '').lower()
-                if region.replace('-', '') in container_name or region in container_name:
-                    region_containers.append(container.get('ID'))
+            # Find running containers for this region
+            region_containers = [
+                container["id"]
+                for container in self.topology_discovery.get_topology().containers_for_region(region)
+            ]
             
             if not region_containers:
                 logger.warning(f"No containers found for region {region}, simulating failure")
@@ -255,6 +911,7 @@ class ChaosTestSuite:
                     logger.info(f"Stopped container {container_id} for region {region}")
                 else:
                     logger.error(f"Failed to stop container {container_id}: {stop_result.stderr}")
+            self.topology_discovery.invalidate()
             
             # Wait for the change to take effect
             time.sleep(5)
@@ -356,25 +1013,11 @@ class ChaosTestSuite:
                 return True
             
             # Find stopped containers for this region
-            cmd = ["docker", "ps", "-a", "--format", "json"]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode != 0:
-                logger.error(f"Failed to list containers: {result.stderr}")
-                return False
-            
-            containers = []
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    containers.append(json.loads(line))
-            
-            # Find stopped containers for this region
-            region_containers = []
-            for container in containers:
-                container_name = container.get('Names', '').lower()
-                status = container.get('State', '').lower()
-                if (region.replace('-', '') in container_name or region in container_name) and 'exited' in status:
-                    region_containers.append(container.get('ID'))
+            self.topology_discovery.invalidate()
+            region_containers = [
+                container["id"]
+                for container in self.topology_discovery.get_topology().containers_for_region(region, state="exited")
+            ]
             
             # Start containers for this region
             for container_id in region_containers:
@@ -384,9 +1027,9 @@ class ChaosTestSuite:
                     logger.info(f"Started container {container_id} for region {region}")
                 else:
                     logger.error(f"Failed to start container {container_id}: {start_result.stderr}")
+            self.topology_discovery.invalidate()
             
-            # Wait for services to become healthy
-            time.sleep(10)
+            # test_scenario polls until the region is healthy again, so there is no fixed wait here
             return True
                 
         except Exception as e:
@@ -418,9 +1061,272 @@ class ChaosTestSuite:
             logger.error(f"Error restoring Route53 service in {region}: {e}")
             return False
     
+    def load_resource_pressure_config(self, config_path: str = "chaos_config.json") -> Dict:
+        """Load resource-pressure ramp profiles, falling back to the built-in defaults"""
+        config = json.loads(json.dumps(DEFAULT_RESOURCE_PRESSURE_CONFIG))
+        try:
+            with open(config_path) as f:
+                overrides = json.load(f).get("resource_pressure", {})
+            profiles = overrides.pop("profiles", {})
+            config.update(overrides)
+            config["profiles"].update(profiles)
+        except FileNotFoundError:
+            logger.info(f"No config file at {config_path}, using default resource-pressure profiles")
+        except Exception as e:
+            logger.warning(f"Failed to load resource-pressure config from {config_path}: {e}")
+        return config
+    
+    def _inspect_resource_limits(self, container_id: str) -> Optional[Dict[str, int]]:
+        """Read the current cgroup-backed resource limits of a container"""
+        cmd = ["docker", "inspect", "--format", "{{json .HostConfig}}", container_id]
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        
+        if result.returncode != 0:
+            logger.error(f"Failed to inspect container {container_id}: {result.stderr}")
+            return None
+        
+        host_config = json.loads(result.stdout)
+        return {field: host_config.get(field) or 0 for field in RESOURCE_LIMIT_FIELDS}
+    
+    def _docker_update(self, container_id: str, args: List[str]) -> bool:
+        cmd = ["docker", "update"] + args + [container_id]
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        if result.returncode != 0:
+            logger.error(f"Failed to update container {container_id} with {args}: {result.stderr.strip()}")
+            return False
+        return True
+    
+    def _apply_resource_limits(self, container_id: str, step: Dict, original: Dict[str, int]) -> bool:
+        """Tighten a container's CPU, memory and block-I/O limits to one ramp step"""
+        args = []
+        
+        if "cpus" in step:
+            # Docker refuses to mix --cpus with --cpu-quota, so keep using whichever the container started with
+            if original["NanoCpus"]:
+                args += ["--cpus", str(step["cpus"])]
+            else:
+                period = original["CpuPeriod"] or DEFAULT_CPU_PERIOD
+                args += ["--cpu-period", str(period), "--cpu-quota", str(int(step["cpus"] * period))]
+        
+        if "memory_mb" in step:
+            memory = f"{step['memory_mb']}m"
+            args += ["--memory", memory, "--memory-swap", memory]
+        
+        if "blkio_weight" in step:
+            args += ["--blkio-weight", str(step["blkio_weight"])]
+        
+        return self._docker_update(container_id, args) if args else True
+    
+    def _restore_resource_limits(self, container_id: str, original: Dict[str, int], tightened: Set[str]) -> bool:
+        """Put back the resource limits captured before the ramp started for every limit that was tightened"""
+        try:
+            args = []
+            
+            if "cpus" in tightened:
+                if original["NanoCpus"]:
+                    args += ["--cpus", str(original["NanoCpus"] / 1e9)]
+                else:
+                    # A quota of -1 is how the cgroup expresses "no CPU limit"
+                    args += ["--cpu-period", str(original["CpuPeriod"] or DEFAULT_CPU_PERIOD),
+                             "--cpu-quota", str(original["CpuQuota"] or -1)]
+            
+            if "memory_mb" in tightened:
+                if original["Memory"]:
+                    args += ["--memory", str(original["Memory"]),
+                             "--memory-swap", str(original["MemorySwap"] or -1)]
+                else:
+                    # docker update treats 0 as "unchanged" and cannot remove a memory limit,
+                    # so an unlimited container gets a limit equal to the host's total memory
+                    args += ["--memory", str(self._host_total_memory()), "--memory-swap", "-1"]
+            
+            if "blkio_weight" in tightened:
+                # Like memory, a block-I/O weight cannot be unset again. _blkio_weight_restorable
+                # only lets an unset weight be tightened on cgroup v1, where it has a real default.
+                args += ["--blkio-weight", str(original["BlkioWeight"] or CGROUP_V1_DEFAULT_BLKIO_WEIGHT)]
+            
+            return self._docker_update(container_id, args) if args else True
+        except Exception as e:
+            logger.error(f"Error restoring resource limits of {container_id}: {e}")
+            return False
+    
+    def _blkio_weight_restorable(self, original: Dict[str, int]) -> bool:
+        """Whether a block-I/O weight change on this container can be undone afterwards"""
+        return bool(original["BlkioWeight"]) or self._docker_cgroup_version() == "1"
+    
+    def _docker_cgroup_version(self) -> str:
+        """Cgroup version ("1" or "2") used by the Docker daemon"""
+        if self._cgroup_version is None:
+            cmd = ["docker", "info", "--format", "{{.CgroupVersion}}"]
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            self._cgroup_version = result.stdout.strip()
+        return self._cgroup_version
+    
+    @staticmethod
+    def _normalize_resource_limits(limits: Optional[Dict[str, int]]) -> Optional[Dict[str, int]]:
+        """Map the different spellings of "unlimited" (0 and -1) onto one value for comparison"""
+        if limits is None:
+            return None
+        normalized = {field: max(value, 0) for field, value in limits.items()}
+        normalized["CpuPeriod"] = normalized["CpuPeriod"] or DEFAULT_CPU_PERIOD
+        return normalized
+    
+    def _host_total_memory(self) -> int:
+        cmd = ["docker", "info", "--format", "{{.MemTotal}}"]
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        return int(result.stdout.strip())
+    
+    def _measure_region_latency(self, region: str, request_count: int) -> Dict:
+        """Send a burst of requests to a region's nginx containers and summarise latency and errors"""
+        ports = self.topology_discovery.get_topology().endpoints(region).get(region, [])
+        if not ports:
+            logger.warning(f"No container port found for {region}, cannot measure latency")
+            return {"requests": 0, "error_rate": None, "latency_ms": {}}
+        
+        # Spread the requests round-robin over every replica of the region
+        latencies = np.full(request_count, np.nan)
+        for i in range(request_count):
+            port = ports[i % len(ports)]
+            request_start = time.perf_counter()
+            try:
+                response = requests.get(f"http://172.17.0.1:{port}", timeout=5)
+                if response.status_code == 200:
+                    latencies[i] = (time.perf_counter() - request_start) * 1000
+            except Exception:
+                pass
+        
+        successful = latencies[~np.isnan(latencies)]
+        measurement = {
+            "requests": request_count,
+            "error_rate": float(1.0 - successful.size / request_count),
+            "latency_ms": {}
+        }
+        if successful.size:
+            p50, p95, p99 = np.percentile(successful, [50, 95, 99])
+            measurement["latency_ms"] = {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+        return measurement
+    
+    def inject_chaos_resource_pressure(self, region: str, profile_name: str,
+                                       config_path: str = "chaos_config.json") -> Dict:
+        """Ramp down CPU, memory and block-I/O limits of a region's containers and measure the degradation"""
+        self.phase = "resource_pressure"
+        config = self.load_resource_pressure_config(config_path)
+        pressure_result = {
+            "region": region,
+            "profile": profile_name,
+            "original_limits": {},
+            "baseline": {},
+            "steps": [],
+            "capacity_point": None,
+            "restoration_success": False,
+            "restored_exactly": False,
+            "skipped_limits": {}
+        }
+        
+        profile = config["profiles"].get(profile_name)
+        if not profile:
+            logger.error(f"Unknown resource-pressure profile: {profile_name}")
+            pressure_result["error"] = f"Unknown resource-pressure profile: {profile_name}"
+            return pressure_result
+        
+        container_ids = [
+            container["id"]
+            for container in self.topology_discovery.get_topology().containers_for_region(region)
+        ]
+        if not container_ids:
+            logger.error(f"No running containers found for region {region}")
+            pressure_result["error"] = f"No running containers found for region {region}"
+            return pressure_result
+        
+        for container_id in container_ids:
+            limits = self._inspect_resource_limits(container_id)
+            if limits is None:
+                pressure_result["error"] = f"Could not read resource limits of {container_id}"
+                return pressure_result
+            pressure_result["original_limits"][container_id] = limits
+        
+        # Never apply a change that cannot be undone: on cgroup v2 an unset block-I/O weight has no
+        # equivalent to restore, so the weight is left out of every step for such containers
+        if any("blkio_weight" in step for step in profile) and not all(
+            self._blkio_weight_restorable(original) for original in pressure_result["original_limits"].values()
+        ):
+            reason = "containers without a block-I/O weight cannot have it restored on cgroup v2"
+            logger.warning(f"Skipping blkio_weight in profile {profile_name}: {reason}")
+            pressure_result["skipped_limits"]["blkio_weight"] = reason
+            profile = [
+                {key: value for key, value in step.items() if key != "blkio_weight"}
+                for step in profile
+            ]
+            profile = [step for step in profile if set(step) - {"name"}]
+            if not profile:
+                pressure_result["error"] = f"Profile {profile_name} only changes limits that cannot be restored"
+                logger.error(pressure_result["error"])
+                return pressure_result
+        
+        logger.info(f"Measuring baseline latency for {region}", extra={"region": region, "phase": self.phase})
+        baseline = self._measure_region_latency(region, config["requests_per_step"])
+        pressure_result["baseline"] = baseline
+        baseline_p95 = baseline["latency_ms"].get("p95")
+        
+        try:
+            for index, step in enumerate(profile):
+                step_name = step.get("name", f"step_{index + 1}")
+                logger.info(f"Applying resource-pressure step {step_name} to {region}: {step}")
+                applied = [
+                    self._apply_resource_limits(container_id, step, pressure_result["original_limits"][container_id])
+                    for container_id in container_ids
+                ]
+                if not all(applied):
+                    logger.warning(f"Step {step_name} was not applied to every container in {region}, "
+                                   f"it cannot be a capacity point")
+                time.sleep(config["step_duration"])
+                
+                measurement = self._measure_region_latency(region, config["requests_per_step"])
+                p95 = measurement["latency_ms"].get("p95")
+                logger.info(
+                    f"Step {step_name} in {region}: error rate {measurement['error_rate']}, p95 latency {p95}",
+                    extra={"region": region, "phase": self.phase, "latency_ms": p95}
+                )
+                pressure_result["steps"].append({
+                    "name": step_name,
+                    "limits": step,
+                    "applied": all(applied),
+                    **measurement
+                })
+                
+                degraded = all(applied) and ((
+                    measurement["error_rate"] is not None
+                    and measurement["error_rate"] > config["error_rate_threshold"]
+                ) or (
+                    p95 is not None and baseline_p95
+                    and p95 > baseline_p95 * config["latency_degradation_factor"]
+                ))
+                if degraded and pressure_result["capacity_point"] is None:
+                    pressure_result["capacity_point"] = step_name
+                    logger.warning(f"Capacity point for {region} reached at step {step_name}: {step}")
+        finally:
+            logger.info(f"Restoring original resource limits for {region}")
+            tightened = {key for step in profile for key in step if key != "name"}
+            restored = [
+                self._restore_resource_limits(container_id, original, tightened)
+                for container_id, original in pressure_result["original_limits"].items()
+            ]
+            pressure_result["restoration_success"] = all(restored)
+            
+            restored_exactly = True
+            for container_id, original in pressure_result["original_limits"].items():
+                current = self._inspect_resource_limits(container_id)
+                if self._normalize_resource_limits(current) != self._normalize_resource_limits(original):
+                    restored_exactly = False
+                    logger.warning(f"Resource limits of {container_id} differ after restoration: "
+                                   f"original {original}, current {current}")
+            pressure_result["restored_exactly"] = restored_exactly
+        
+        return pressure_result
+    
     def initial_health_check(self) -> bool:
         """Perform initial health check of all services"""
         logger.info("=== Starting Initial Health Check ===")
+        self.phase = "health_check"
         
         # Check LocalStack health
         if not self.check_localstack_health():
@@ -441,7 +1347,7 @@ class ChaosTestSuite:
             logger.warning("No container ports found, skipping container connectivity tests")
             container_results = {}
         else:
-            container_results = self.test_container_connectivity(container_ports)
+            container_results, _ = self.test_container_connectivity(container_ports)
         
         # Check if at least LocalStack is working (relaxed check)
         if infrastructure_deployed:
@@ -476,10 +1382,15 @@ class ChaosTestSuite:
         scenario_result = {
             "failed_region": failed_region,
             "expected_working_region": expected_working_region,
+            "start_time": datetime.now().isoformat(),
             "chaos_injection_success": False,
             "connectivity_during_failure": {},
             "restoration_success": False,
             "connectivity_after_restoration": {},
+            "simulated": False,
+            "recovered": False,
+            "recovery_time_seconds": None,
+            "error_rate": None,
             "overall_success": False
         }
         
@@ -488,6 +1399,7 @@ class ChaosTestSuite:
         
         # Step 1: Inject chaos
         logger.info(f"Step 1: Injecting chaos in {failed_region}")
+        self.phase = "chaos_injection"
         
         if infrastructure_deployed:
             # Try Route53 chaos first, then Docker as fallback
@@ -498,6 +1410,7 @@ class ChaosTestSuite:
             # If no infrastructure, simulate chaos
             logger.info(f"No infrastructure deployed, simulating chaos for {failed_region}")
             chaos_success = True
+            scenario_result["simulated"] = True
         
         scenario_result["chaos_injection_success"] = chaos_success
         
@@ -507,13 +1420,17 @@ class ChaosTestSuite:
         
         # Step 2: Test connectivity during failure
         logger.info(f"Step 2: Testing connectivity during {failed_region} failure")
+        self.phase = "during_failure"
         dns_results = self.test_dns_resolution()
         container_ports = self.get_container_ports()
-        container_results = self.test_container_connectivity(container_ports) if container_ports else {}
+        container_results, replica_results = (
+            self.test_container_connectivity(container_ports) if container_ports else ({}, {})
+        )
         
         scenario_result["connectivity_during_failure"] = {
             "dns": dns_results,
-            "containers": container_results
+            "containers": container_results,
+            "replicas": replica_results
         }
         
         # Check if the expected working region is still accessible
@@ -534,6 +1451,8 @@ class ChaosTestSuite:
         
         # Step 3: Restore the failed region
         logger.info(f"Step 3: Restoring {failed_region}")
+        self.phase = "restoration"
+        restoration_start = time.monotonic()
         
         if infrastructure_deployed:
             restore_success = self.restore_route53_service(failed_region) and self.restore_docker_service(failed_region)
@@ -550,30 +1469,57 @@ class ChaosTestSuite:
         
         # Step 4: Test connectivity after restoration
         logger.info(f"Step 4: Testing connectivity after {failed_region} restoration")
-        dns_results_after = self.test_dns_resolution()
-        container_ports_after = self.get_container_ports()
-        container_results_after = self.test_container_connectivity(container_ports_after) if container_ports_after else {}
+        self.phase = "after_restoration"
+        
+        # Poll until every region serves traffic again, or give up after recovery_timeout
+        while True:
+            dns_results_after = self.test_dns_resolution()
+            container_ports_after = self.get_container_ports()
+            container_results_after, replica_results_after = (
+                self.test_container_connectivity(container_ports_after) if container_ports_after else ({}, {})
+            )
+            
+            if infrastructure_deployed:
+                unrestored_regions = [
+                    region for region in self.regions
+                    if not (dns_results_after.get(region, False) or container_results_after.get(region, False))
+                ]
+            else:
+                # If no infrastructure, assume restoration works
+                unrestored_regions = []
+                logger.info("No infrastructure deployed, assuming both regions would be restored")
+            
+            elapsed = time.monotonic() - restoration_start
+            if not unrestored_regions or elapsed >= self.recovery_timeout:
+                break
+            logger.info(f"Waiting for {unrestored_regions} to recover ({elapsed:.1f}s elapsed)")
+            time.sleep(self.recovery_poll_interval)
         
         scenario_result["connectivity_after_restoration"] = {
             "dns": dns_results_after,
-            "containers": container_results_after
+            "containers": container_results_after,
+            "replicas": replica_results_after
         }
         
-        # Check if both regions are working after restoration
-        if infrastructure_deployed:
-            both_regions_ok = True
-            for region in self.regions:
-                region_ok = (
-                    dns_results_after.get(region, False) or 
-                    container_results_after.get(region, False)
-                )
-                if not region_ok:
-                    both_regions_ok = False
-                    logger.warning(f"Region {region} not fully restored")
+        both_regions_ok = not unrestored_regions
+        scenario_result["recovered"] = both_regions_ok
+        if not infrastructure_deployed:
+            # Nothing was actually failed or restored, so there is no recovery time or error rate to report
+            logger.info(f"Scenario {scenario_name} was simulated, not recording recovery time or error rate")
         else:
-            # If no infrastructure, assume restoration works
-            both_regions_ok = True
-            logger.info("No infrastructure deployed, assuming both regions would be restored")
+            if both_regions_ok:
+                scenario_result["recovery_time_seconds"] = elapsed
+                logger.info(f"Recovery of {failed_region} took {elapsed:.2f}s")
+            else:
+                # Record the timeout as a capped recovery time so slow recoveries still count in the history
+                scenario_result["recovery_time_seconds"] = self.recovery_timeout
+                for region in unrestored_regions:
+                    logger.warning(f"Region {region} not fully restored after {self.recovery_timeout:.0f}s")
+            scenario_result["error_rate"] = self._probe_error_rate(
+                scenario_result["connectivity_during_failure"],
+                scenario_result["connectivity_after_restoration"],
+                expected_working_region
+            )
         
         scenario_result["overall_success"] = working_region_ok and restore_success and both_regions_ok
         
@@ -584,6 +1530,31 @@ class ChaosTestSuite:
         
         return scenario_result
     
+    @staticmethod
+    def _probe_error_rate(during_failure: Dict, after_restoration: Dict,
+                          expected_working_region: str) -> Optional[float]:
+        """Fraction of failed probes that should have succeeded: during the failure only the global
+        endpoint and the expected working region count, after restoration every region does"""
+        def outcomes_of(section: Dict, regions: Optional[Set[str]] = None) -> List[bool]:
+            # Count every replica on its own rather than the per-region container summary,
+            # so a region with one dead replica out of three shows up as partial errors
+            selected = [
+                success for region, success in section.get("dns", {}).items()
+                if regions is None or region in regions
+            ]
+            for region, replicas in section.get("replicas", {}).items():
+                if regions is None or region in regions:
+                    selected.extend(replicas.values())
+            return selected
+        
+        outcomes = (
+            outcomes_of(during_failure, {"global", expected_working_region})
+            + outcomes_of(after_restoration)
+        )
+        if not outcomes:
+            return None
+        return 1.0 - sum(bool(success) for success in outcomes) / len(outcomes)
+    
     def run_full_test_suite(self) -> Dict:
         """Run the complete chaos engineering test suite"""
         logger.info("=== Starting LocalStack Chaos Engineering Test Suite ===")
@@ -643,10 +1614,35 @@ class ChaosTestSuite:
         else:
             return {"error": f"Unknown scenario: {scenario}"}
         
+        self.test_results["scenarios"][f"disable_{scenario.replace('-', '_')}"] = result
+        self.test_results["end_time"] = datetime.now().isoformat()
+        
         return {"scenario": result}
     
-    def generate_report(self) -> str:
-        """Generate a human-readable test report"""
+    def run_resource_pressure(self, region: str, profile_name: str,
+                              config_path: str = "chaos_config.json") -> Dict:
+        """Run a resource-pressure ramp against a single region"""
+        logger.info(f"=== Running Resource Pressure: {region} ({profile_name}) ===")
+        
+        # Initial health check
+        if not self.initial_health_check():
+            self.test_results["overall_status"] = "FAILED"
+            self.test_results["error"] = "Initial health check failed"
+            return self.test_results
+        
+        pressure_result = self.inject_chaos_resource_pressure(region, profile_name, config_path)
+        self.test_results.setdefault("resource_pressure", {})[region] = pressure_result
+        
+        if pressure_result["restoration_success"] and "error" not in pressure_result:
+            self.test_results["overall_status"] = "PASSED"
+        else:
+            self.test_results["overall_status"] = "FAILED"
+        self.test_results["end_time"] = datetime.now().isoformat()
+        
+        return self.test_results
+    
+    def generate_report(self, history: Optional[ResultsHistoryAnalyzer] = None) -> str:
+        """Generate a human-readable test report, with historical trends when a history analyzer is given"""
         report = []
         report.append("=" * 60)
         report.append("LOCALSTACK CHAOS ENGINEERING TEST REPORT")
@@ -662,12 +1658,39 @@ class ChaosTestSuite:
             report.append(f"  Expected Working Region: {scenario_data.get('expected_working_region', 'Unknown')}")
             report.append(f"  Chaos Injection: {'✓' if scenario_data.get('chaos_injection_success') else '✗'}")
             report.append(f"  Restoration: {'✓' if scenario_data.get('restoration_success') else '✗'}")
+            if scenario_data.get("recovery_time_seconds") is not None:
+                report.append(f"  Recovery Time: {scenario_data['recovery_time_seconds']:.2f}s"
+                              f"{'' if scenario_data.get('recovered') else ' (timed out)'}")
+            if scenario_data.get("error_rate") is not None:
+                report.append(f"  Probe Error Rate: {scenario_data['error_rate']:.1%}")
             report.append(f"  Overall Success: {'✓' if scenario_data.get('overall_success') else '✗'}")
             report.append("")
         
+        for region, pressure_data in self.test_results.get("resource_pressure", {}).items():
+            report.append(f"Resource Pressure: {region} ({pressure_data.get('profile', 'Unknown')})")
+            baseline_p95 = pressure_data.get("baseline", {}).get("latency_ms", {}).get("p95")
+            if baseline_p95 is not None:
+                report.append(f"  Baseline p95 Latency: {baseline_p95:.1f}ms")
+            for step in pressure_data.get("steps", []):
+                p95 = step.get("latency_ms", {}).get("p95")
+                latency = f"{p95:.1f}ms" if p95 is not None else "n/a"
+                error_rate = f"{step['error_rate']:.1%}" if step.get("error_rate") is not None else "n/a"
+                report.append(f"  {step['name']}: p95 {latency}, errors {error_rate}"
+                              f"{'' if step.get('applied') else ' (not applied)'}")
+            report.append(f"  Capacity Point: {pressure_data.get('capacity_point') or 'not reached'}")
+            report.append(f"  Restoration: {'✓' if pressure_data.get('restoration_success') else '✗'}"
+                          f"{'' if pressure_data.get('restored_exactly') else ' (limits differ from original)'}")
+            for limit, reason in pressure_data.get("skipped_limits", {}).items():
+                report.append(f"  Skipped {limit}: {reason}")
+            report.append("")
+        
         report.append(f"Final Health Check: {'✓' if self.test_results.get('final_health_check') else '✗'}")
         report.append("=" * 60)
         
+        if history is not None:
+            report.append("")
+            report.append(history.generate_history_report(run_id=self.run_id))
+        
         return "\n".join(report)
 
 
@@ -679,12 +1702,46 @@ def main():
                        help="Run quick health check only")
     parser.add_argument("--full-test", action="store_true", 
                        help="Run full test suite (default)")
+    parser.add_argument("--resource-pressure", choices=["us-east-1", "us-west-1"],
+                       help="Throttle CPU, memory and block I/O of a region's containers instead of stopping them")
+    parser.add_argument("--pressure-profile", default="cpu_ramp",
+                       help="Ramp profile for --resource-pressure (see resource_pressure.profiles in the config)")
+    parser.add_argument("--config", default="chaos_config.json",
+                       help="Config file with resource-pressure ramp profiles")
     parser.add_argument("--output", default="chaos_test_results.json",
                        help="Output file for test results")
+    parser.add_argument("--recovery-timeout", type=float, default=60.0,
+                       help="Seconds to wait for all regions to recover after restoration")
+    parser.add_argument("--history-db", default="chaos_history.db",
+                       help="SQLite database that accumulates results across runs")
+    parser.add_argument("--no-history", action="store_true",
+                       help="Do not record this run in the history database")
+    parser.add_argument("--history-report", action="store_true",
+                       help="Print historical trends and regressions from the history database and exit")
+    parser.add_argument("--history-scenario",
+                       help="Restrict the history report to a single scenario (e.g. disable_us_east_1)")
+    parser.add_argument("--history-limit", type=int,
+                       help="Only analyze the most recent N runs in the history report")
     
     args = parser.parse_args()
     
+    if args.history_report:
+        store = ResultsHistoryStore(args.history_db)
+        try:
+            analyzer = ResultsHistoryAnalyzer(store)
+            latest_run = store.latest_run_id(args.history_scenario)
+            print(analyzer.generate_history_report(
+                run_id=latest_run, scenario=args.history_scenario, limit=args.history_limit
+            ))
+            regressions = analyzer.detect_regressions(
+                latest_run, args.history_scenario, args.history_limit
+            ) if latest_run else []
+        finally:
+            store.close()
+        sys.exit(1 if regressions else 0)
+    
     chaos_suite = ChaosTestSuite()
+    chaos_suite.recovery_timeout = args.recovery_timeout
     
     try:
         if args.quick:
@@ -694,6 +1751,9 @@ def main():
             print(f"Health Check: {'PASSED' if health_ok else 'FAILED'}")
             sys.exit(0 if health_ok else 1)
         
+        elif args.resource_pressure:
+            # Run resource-pressure ramp
+            results = chaos_suite.run_resource_pressure(args.resource_pressure, args.pressure_profile, args.config)
         elif args.scenario:
             # Run single scenario
             results = chaos_suite.run_single_scenario(args.scenario)
@@ -705,8 +1765,16 @@ def main():
         with open(args.output, 'w') as f:
             json.dump(results, f, indent=2)
         
-        # Generate and display report
-        report = chaos_suite.generate_report()
+        # Record the run in the history store and display the report with trends
+        if args.no_history:
+            report = chaos_suite.generate_report()
+        else:
+            store = ResultsHistoryStore(args.history_db)
+            try:
+                store.record_run(chaos_suite.run_id, chaos_suite.test_results)
+                report = chaos_suite.generate_report(history=ResultsHistoryAnalyzer(store))
+            finally:
+                store.close()
         print("\n" + report)
         
         # Exit with appropriate code